@@ -51,4 +51,81 @@ def simulate_inventory(
             "Fulfilled": fulfilled
         })
 
-    return pd.DataFrame(records)
\ No newline at end of file
+    return pd.DataFrame(records)
+
+def simulate_inventory_batch(
+    demand,
+    policy="EOQ",
+    lead_time=2,
+    eoq_qty=5000,
+    s=3000,
+    S=8000,
+    initial_stock=10000
+):
+    """Run simulate_inventory for many scenarios at once.
+
+    `demand` has shape (n_scenarios, weeks). Every other parameter except
+    `policy` may be a scalar or a length-n_scenarios array. Returns a list
+    with one DataFrame per scenario, in the same layout as simulate_inventory.
+    """
+
+    demand = np.atleast_2d(np.asarray(demand, dtype=float))
+    n, weeks = demand.shape
+
+    lead_time = np.broadcast_to(np.asarray(lead_time, dtype=int), (n,))
+    eoq_qty = np.broadcast_to(np.asarray(eoq_qty, dtype=float), (n,))
+    s = np.broadcast_to(np.asarray(s, dtype=float), (n,))
+    S = np.broadcast_to(np.asarray(S, dtype=float), (n,))
+
+    if (lead_time < 1).any():
+        raise ValueError("lead_time must be at least 1 week")
+
+    stock = np.broadcast_to(np.asarray(initial_stock, dtype=float), (n,)).copy()
+    # arrivals[i, t] is the quantity received by scenario i at the start of week t
+    arrivals = np.zeros((n, weeks + lead_time.max()))
+    rows = np.arange(n)
+
+    stock_hist = np.empty((n, weeks))
+    order_hist = np.empty((n, weeks))
+    lost_hist = np.empty((n, weeks))
+    fulfilled_hist = np.empty((n, weeks))
+
+    for t in range(weeks):
+
+        stock += arrivals[:, t]
+
+        d = demand[:, t]
+        fulfilled = np.minimum(stock, d)
+        lost_sales = np.maximum(d - stock, 0)
+
+        stock -= fulfilled
+
+        if policy == "EOQ":
+            order_qty = np.where(stock < eoq_qty, eoq_qty, 0.0)
+
+        elif policy == "(s,S)":
+            order_qty = np.where(stock < s, S - stock, 0.0)
+
+        else:
+            order_qty = np.zeros(n)
+
+        arrivals[rows, t + lead_time] += order_qty
+
+        stock_hist[:, t] = stock
+        order_hist[:, t] = order_qty
+        lost_hist[:, t] = lost_sales
+        fulfilled_hist[:, t] = fulfilled
+
+    week = np.arange(1, weeks + 1)
+
+    return [
+        pd.DataFrame({
+            "Week": week,
+            "Demand": demand[i],
+            "Stock": stock_hist[i],
+            "Order": order_hist[i],
+            "Lost_Sales": lost_hist[i],
+            "Fulfilled": fulfilled_hist[i]
+        })
+        for i in range(n)
+    ]
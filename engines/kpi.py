@@ -1,4 +1,16 @@
-def compute_kpis(df, holding_cost=1, order_cost=0, penalty_cost=0):
+KPI_DECIMALS = {
+    "Fill Rate": 3,
+    "Service Level": 3,
+    "DIO": 1,
+    "Avg Inventory": 0,
+    "Holding Cost": 0,
+    "Ordering Cost": 0,
+    "Penalty Cost": 0,
+    "Total Cost": 0
+}
+
+
+def compute_kpis_raw(df, holding_cost=1, order_cost=0, penalty_cost=0):
 
     total_demand = df["Demand"].sum()
     total_fulfilled = df["Fulfilled"].sum()
@@ -20,12 +32,20 @@ def compute_kpis(df, holding_cost=1, order_cost=0, penalty_cost=0):
     total_cost = holding_total + ordering_total + penalty_total
 
     return {
-        "Fill Rate": round(fill_rate, 3),
-        "Service Level": round(service_level, 3),
-        "DIO": round(dio, 1),
-        "Avg Inventory": round(avg_inventory, 0),
-        "Holding Cost": round(holding_total, 0),
-        "Ordering Cost": round(ordering_total, 0),
-        "Penalty Cost": round(penalty_total, 0),
-        "Total Cost": round(total_cost, 0)
-    }
\ No newline at end of file
+        "Fill Rate": fill_rate,
+        "Service Level": service_level,
+        "DIO": dio,
+        "Avg Inventory": avg_inventory,
+        "Holding Cost": holding_total,
+        "Ordering Cost": ordering_total,
+        "Penalty Cost": penalty_total,
+        "Total Cost": total_cost
+    }
+
+
+def round_kpis(kpis):
+    return {k: round(v, KPI_DECIMALS[k]) for k, v in kpis.items()}
+
+
+def compute_kpis(df, holding_cost=1, order_cost=0, penalty_cost=0):
+    return round_kpis(compute_kpis_raw(df, holding_cost, order_cost, penalty_cost))
@@ -0,0 +1,196 @@
+from dataclasses import astuple, replace
+
+import numpy as np
+import pandas as pd
+
+from engines.demand import generate_demand
+from engines.forecast import exponential_smoothing
+from engines.inventory import simulate_inventory_batch
+from engines.warehouse import apply_capacity
+from engines.kpi import KPI_DECIMALS, compute_kpis_raw
+
+
+SIM_PARAMS = ["base_level", "alpha", "lead_time", "eoq_qty", "s", "S", "capacity"]
+COST_PARAMS = ["holding_cost", "order_cost", "penalty_cost"]
+
+INT_PARAMS = {"base_level", "lead_time", "eoq_qty", "s", "S", "capacity"}
+
+
+def _perturb(name, value, rel_step):
+    """Return the (low, high) values used for a central difference on `name`."""
+
+    step = abs(value) * rel_step
+
+    if name in INT_PARAMS:
+        step = max(int(round(step)), 1)
+    elif step == 0:
+        step = rel_step
+
+    low, high = value - step, value + step
+
+    if name == "lead_time":
+        low = max(low, 1)
+    elif name == "alpha":
+        low, high = max(low, 1e-6), min(high, 1.0)
+    else:
+        low = max(low, 0)
+
+    return low, high
+
+
+def _batch_kpis(sim_configs, cost_configs):
+    """Simulate every distinct SimulationConfig once and score each pair.
+
+    All scenarios use the same demand seed (common random numbers), so two
+    scenarios only differ through the parameters that were perturbed.
+    Scenarios that differ only in CostConfig reuse the same simulation.
+    """
+
+    keys = [astuple(c) for c in sim_configs]
+    unique = {}
+    for key, cfg in zip(keys, sim_configs):
+        unique.setdefault(key, cfg)
+
+    unique_cfgs = list(unique.values())
+    policies = {c.policy for c in unique_cfgs}
+    weeks = {c.weeks for c in unique_cfgs}
+    if len(policies) > 1 or len(weeks) > 1:
+        raise ValueError("batched scenarios must share policy and weeks")
+
+    demand_cache = {}
+    demand_rows = []
+    for cfg in unique_cfgs:
+        if cfg.base_level not in demand_cache:
+            demand_cache[cfg.base_level] = generate_demand(
+                weeks=cfg.weeks,
+                base_level=cfg.base_level
+            )["Actual_Demand"].values
+
+        actual = demand_cache[cfg.base_level]
+        if cfg.use_forecast:
+            demand_rows.append(exponential_smoothing(actual, alpha=cfg.alpha))
+        else:
+            demand_rows.append(actual)
+
+    inventories = simulate_inventory_batch(
+        demand=np.vstack(demand_rows),
+        policy=unique_cfgs[0].policy,
+        lead_time=[c.lead_time for c in unique_cfgs],
+        eoq_qty=[c.eoq_qty for c in unique_cfgs],
+        s=[c.s for c in unique_cfgs],
+        S=[c.S for c in unique_cfgs]
+    )
+
+    inventory_by_key = {
+        key: apply_capacity(df, cfg.capacity)
+        for (key, cfg), df in zip(unique.items(), inventories)
+    }
+
+    return [
+        compute_kpis_raw(
+            inventory_by_key[key],
+            holding_cost=cost.holding_cost,
+            order_cost=cost.order_cost,
+            penalty_cost=cost.penalty_cost
+        )
+        for key, cost in zip(keys, cost_configs)
+    ]
+
+
+def run_sensitivity(sim_config, cost_config, params=None, rel_step=0.1):
+    """One-at-a-time sensitivity of every KPI to the given parameters.
+
+    Each parameter is moved down and up by `rel_step` (at least one unit for
+    integer parameters) and all perturbations are simulated in one batch.
+
+    Returns (tornado, elasticities):
+      - tornado: one row per parameter and KPI with the low/high parameter
+        values, the KPI at each end and the swing, sorted by swing per KPI.
+      - elasticities: parameters x KPIs, the central-difference estimate of
+        (dKPI / KPI) / (dparam / param) around the base configuration.
+        NaN where it is undefined (base KPI of 0 or no room to perturb).
+    """
+
+    if not 0 < rel_step < 1:
+        raise ValueError(f"rel_step must be between 0 and 1 (exclusive), got {rel_step}")
+
+    supported = SIM_PARAMS + COST_PARAMS
+
+    if params is None:
+        params = supported
+
+    unknown = [name for name in params if name not in supported]
+    if unknown:
+        raise ValueError(
+            f"Unsupported parameter(s): {', '.join(unknown)}. "
+            f"Supported: {', '.join(supported)}"
+        )
+
+    sim_configs = [sim_config]
+    cost_configs = [cost_config]
+    bounds = {}
+
+    for name in params:
+        if name in SIM_PARAMS:
+            value = getattr(sim_config, name)
+        else:
+            value = getattr(cost_config, name)
+
+        low, high = _perturb(name, value, rel_step)
+        bounds[name] = (value, low, high)
+
+        for v in (low, high):
+            if name in SIM_PARAMS:
+                sim_configs.append(replace(sim_config, **{name: v}))
+                cost_configs.append(cost_config)
+            else:
+                sim_configs.append(sim_config)
+                cost_configs.append(replace(cost_config, **{name: v}))
+
+    results = _batch_kpis(sim_configs, cost_configs)
+    base = results[0]
+
+    tornado_rows = []
+    elasticity_rows = {}
+
+    for i, name in enumerate(params):
+        value, low, high = bounds[name]
+        kpi_low = results[1 + 2 * i]
+        kpi_high = results[2 + 2 * i]
+        elasticity_rows[name] = {}
+
+        for metric, base_val in base.items():
+            lo, hi = kpi_low[metric], kpi_high[metric]
+            digits = KPI_DECIMALS[metric]
+
+            tornado_rows.append({
+                "Parameter": name,
+                "Metric": metric,
+                "Base Value": value,
+                "Low Value": low,
+                "High Value": high,
+                "KPI Base": round(base_val, digits),
+                "KPI Low": round(lo, digits),
+                "KPI High": round(hi, digits),
+                "Swing": abs(hi - lo)
+            })
+
+            if high != low and base_val != 0:
+                elasticity = (hi - lo) / (high - low) * value / base_val
+            else:
+                elasticity = np.nan
+            elasticity_rows[name][metric] = elasticity
+
+    # Sort on the exact swing, then round it for display like the KPIs
+    tornado = (
+        pd.DataFrame(tornado_rows)
+        .sort_values(["Metric", "Swing"], ascending=[True, False])
+        .reset_index(drop=True)
+    )
+    tornado["Swing"] = [
+        round(v, KPI_DECIMALS[m]) for v, m in zip(tornado["Swing"], tornado["Metric"])
+    ]
+    elasticities = pd.DataFrame.from_dict(elasticity_rows, orient="index")
+    elasticities.index.name = "Parameter"
+
+    return tornado, elasticities
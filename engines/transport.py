@@ -0,0 +1,309 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
+
+
+OVERFLOW_LANE_PREFIX = "Tràn"
+UNROUTED = "Unrouted"
+
+# Lane destinations outside our own warehouse network, with no capacity limit.
+# Every other destination must match locations in the capacity table.
+EXTERNAL_DESTINATIONS = {"3PL"}
+
+COST_COLUMNS = [
+    "Transport Cost (B VND)",
+    "Handling Cost (B VND)",
+    "Warehouse Rent (B VND)"
+]
+
+RESULT_COLUMNS = ["Period", "Lane", "Location", "Tons", "Unit Cost (B VND/t)", "Cost (B VND)"]
+
+# LRU of solutions keyed by a hash of the LP inputs, shared across calls
+_SOLUTION_CACHE = OrderedDict()
+SOLUTION_CACHE_SIZE = 4096
+
+
+def clear_solution_cache():
+    _SOLUTION_CACHE.clear()
+
+
+def _cache_get(key):
+    if key in _SOLUTION_CACHE:
+        _SOLUTION_CACHE.move_to_end(key)
+        return _SOLUTION_CACHE[key]
+    return None
+
+
+def _cache_put(key, x):
+    _SOLUTION_CACHE[key] = x
+    _SOLUTION_CACHE.move_to_end(key)
+    while len(_SOLUTION_CACHE) > SOLUTION_CACHE_SIZE:
+        _SOLUTION_CACHE.popitem(last=False)
+
+
+def lane_unit_costs(lane_df):
+    """Cost per ton (B VND) of every overflow lane, per period.
+
+    Every overflow lane seen anywhere in the table is offered in every
+    period. In periods where a lane carried no volume its unit cost is the
+    mean of its unit costs in the other periods.
+    """
+
+    overflow = lane_df[lane_df["Lane"].str.startswith(OVERFLOW_LANE_PREFIX)]
+    scope = [c for c in ("Scenario",) if c in overflow.columns]
+    keys = scope + ["Period", "Lane"]
+
+    observed = overflow.groupby(keys, sort=False)[["Volume (Tons)"] + COST_COLUMNS].sum().reset_index()
+    observed = observed[observed["Volume (Tons)"] > 0]
+    observed["Unit Cost (B VND/t)"] = observed[COST_COLUMNS].sum(axis=1) / observed["Volume (Tons)"]
+
+    periods = overflow[scope + ["Period"]].drop_duplicates()
+    lanes = observed[scope + ["Lane"]].drop_duplicates()
+    grid = periods.merge(lanes, on=scope) if scope else periods.merge(lanes, how="cross")
+
+    out = grid.merge(
+        observed[keys + ["Volume (Tons)", "Unit Cost (B VND/t)"]],
+        on=keys,
+        how="left"
+    )
+    out["Volume (Tons)"] = out["Volume (Tons)"].fillna(0)
+    lane_mean = out.groupby(scope + ["Lane"], sort=False)["Unit Cost (B VND/t)"].transform("mean")
+    out["Unit Cost (B VND/t)"] = out["Unit Cost (B VND/t)"].fillna(lane_mean)
+    out["Destination"] = out["Lane"].str.split("→").str[-1].str.strip()
+
+    return out[keys + ["Destination", "Volume (Tons)", "Unit Cost (B VND/t)"]]
+
+
+def _spare_capacity(capacity_df):
+    spare = capacity_df["Capacity (tons)"] - capacity_df["Ending Stock (tons)"]
+    return dict(zip(capacity_df["Location"], spare.clip(lower=0)))
+
+
+def _build_problem(lanes, dests, unit_costs, volume, spare):
+    """LP for routing one period's overflow volume.
+
+    One variable per (lane, location) arc; all arcs together must carry the
+    period's overflow volume. Lanes into a warehouse (e.g. "Kho B2B") get an
+    arc per matching location ("Kho B2B - HCM", ...), and arcs into a
+    location share its spare capacity. Lanes into EXTERNAL_DESTINATIONS are
+    uncapacitated. An "Unrouted" arc, costlier than any lane, keeps the LP
+    feasible when the lanes cannot absorb the volume.
+    """
+
+    arcs = []
+    costs = []
+    rows = []
+    locations = []
+
+    for lane, dest, unit_cost in zip(lanes, dests, unit_costs):
+        if dest in EXTERNAL_DESTINATIONS:
+            arcs.append((lane, dest))
+            costs.append(unit_cost)
+            rows.append(-1)
+            continue
+
+        matched = [loc for loc in spare if loc.split(" - ")[0] == dest]
+        if not matched:
+            raise ValueError(
+                f"No capacity rows for warehouse destination {str(dest)!r} "
+                f"of lane {str(lane)!r}"
+            )
+
+        for loc in matched:
+            if loc not in locations:
+                locations.append(loc)
+            arcs.append((lane, loc))
+            costs.append(unit_cost)
+            rows.append(locations.index(loc))
+
+    arcs.append((UNROUTED, UNROUTED))
+    costs.append(max(costs, default=0) * 100 + 1)
+    rows.append(-1)
+
+    return {
+        "arcs": arcs,
+        "c": np.asarray(costs, dtype=float),
+        "row": np.asarray(rows, dtype=int),
+        "b_ub": np.array([spare[loc] for loc in locations], dtype=float),
+        "volume": float(volume),
+    }
+
+
+def _problem_hash(problem):
+    h = hashlib.sha1(repr((problem["arcs"], problem["volume"])).encode())
+    for key in ("c", "row", "b_ub"):
+        h.update(np.ascontiguousarray(problem[key]).tobytes())
+    return h.hexdigest()
+
+
+def _stack(problems):
+    """Block-diagonal LP over several independent problems."""
+
+    eq_rows, ub_rows, ub_cols = [], [], []
+    offsets = [0]
+    ub_offset = 0
+
+    for i, p in enumerate(problems):
+        n_arcs = len(p["arcs"])
+        eq_rows.append(np.full(n_arcs, i))
+
+        capped = np.flatnonzero(p["row"] >= 0)
+        ub_rows.append(p["row"][capped] + ub_offset)
+        ub_cols.append(capped + offsets[-1])
+
+        ub_offset += len(p["b_ub"])
+        offsets.append(offsets[-1] + n_arcs)
+
+    n = offsets[-1]
+    A_eq = csr_matrix(
+        (np.ones(n), (np.concatenate(eq_rows), np.arange(n))),
+        shape=(len(problems), n)
+    )
+
+    ub_rows = np.concatenate(ub_rows)
+    A_ub = csr_matrix(
+        (np.ones(len(ub_rows)), (ub_rows, np.concatenate(ub_cols))),
+        shape=(ub_offset, n)
+    )
+
+    return {
+        "c": np.concatenate([p["c"] for p in problems]),
+        "A_ub": A_ub,
+        "b_ub": np.concatenate([p["b_ub"] for p in problems]),
+        "A_eq": A_eq,
+        "b_eq": np.array([p["volume"] for p in problems]),
+        "offsets": offsets,
+    }
+
+
+def _linprog(lp):
+    has_ub = lp["A_ub"].shape[0] > 0
+    return linprog(
+        lp["c"],
+        A_ub=lp["A_ub"] if has_ub else None,
+        b_ub=lp["b_ub"] if has_ub else None,
+        A_eq=lp["A_eq"],
+        b_eq=lp["b_eq"],
+        bounds=(0, None),
+        method="highs"
+    )
+
+
+def _solve_batch(problems):
+    """Solve independent problems together as one block-diagonal LP."""
+
+    lp = _stack(problems)
+    res = _linprog(lp)
+    if res.status != 0:
+        raise RuntimeError(f"Lane allocation LP failed: {res.message}")
+
+    return [res.x[lp["offsets"][j]:lp["offsets"][j + 1]] for j in range(len(problems))]
+
+
+def solve_lane_allocation_batch(scenarios, carry_capacity=False):
+    """Min-cost routing of overflow volume for many scenarios and periods.
+
+    `scenarios` maps a name to (lane_df, capacity_df). `lane_df` is shaped
+    like make_transport_lane_table; the overflow volume of a period is the
+    total volume on its "Tràn → ..." lanes. `capacity_df` is shaped like
+    make_stock_capacity, optionally with a "Period" column for per-period
+    capacities; every period must then have capacity rows.
+
+    A capacity table without a "Period" column applies to each period
+    independently. With `carry_capacity=True` it is instead treated as a
+    starting snapshot: tons routed into a warehouse stay there and are taken
+    off its spare capacity for the following periods.
+
+    Periods are solved in order. Within a period every scenario is solved in
+    one LP, and solutions are cached by a hash of the LP inputs.
+
+    Returns one row per scenario, period and used arc. Volume no lane could
+    take is reported on an "Unrouted" row with a NaN cost; the penalty used
+    for it inside the LP is not reported.
+    """
+
+    costs = lane_unit_costs(pd.concat(
+        [lane_df.assign(Scenario=name) for name, (lane_df, _) in scenarios.items()],
+        ignore_index=True
+    ))
+    by_key = {key: df for key, df in costs.groupby(["Scenario", "Period"], sort=False)}
+    periods = list(dict.fromkeys(costs["Period"]))
+
+    static_spare = {
+        name: _spare_capacity(cap)
+        for name, (_, cap) in scenarios.items()
+        if "Period" not in cap.columns
+    }
+
+    rows = []
+
+    for period in periods:
+        names = [name for name in scenarios if (name, period) in by_key]
+        problems = {}
+
+        for name in names:
+            lanes = by_key[(name, period)]
+            capacity_df = scenarios[name][1]
+
+            if name in static_spare:
+                spare = static_spare[name] if carry_capacity else dict(static_spare[name])
+            else:
+                period_capacity = capacity_df[capacity_df["Period"] == period]
+                if period_capacity.empty:
+                    raise ValueError(f"No capacity rows for period {period!r} in scenario {name!r}")
+                spare = _spare_capacity(period_capacity)
+
+            problems[name] = _build_problem(
+                lanes["Lane"],
+                lanes["Destination"],
+                lanes["Unit Cost (B VND/t)"],
+                lanes["Volume (Tons)"].sum(),
+                spare
+            )
+
+        keys = {name: _problem_hash(p) for name, p in problems.items()}
+        solutions = {key: _cache_get(key) for key in set(keys.values())}
+        pending = list({keys[n]: n for n in names if solutions[keys[n]] is None}.values())
+
+        if pending:
+            solved = _solve_batch([problems[n] for n in pending])
+            for n, x in zip(pending, solved):
+                solutions[keys[n]] = x
+                _cache_put(keys[n], x)
+
+        for name in names:
+            p = problems[name]
+            x = solutions[keys[name]]
+            used = np.flatnonzero(x > 1e-6)
+
+            for k in used:
+                lane, loc = p["arcs"][k]
+                unit_cost = np.nan if lane == UNROUTED else p["c"][k]
+
+                if carry_capacity and name in static_spare and loc in static_spare[name]:
+                    static_spare[name][loc] = max(static_spare[name][loc] - x[k], 0)
+
+                rows.append({
+                    "Scenario": name,
+                    "Period": period,
+                    "Lane": lane,
+                    "Location": loc,
+                    "Tons": round(x[k], 0),
+                    "Unit Cost (B VND/t)": unit_cost,
+                    "Cost (B VND)": round(x[k] * unit_cost, 2)
+                })
+
+    df = pd.DataFrame(rows, columns=["Scenario"] + RESULT_COLUMNS)
+    order = {name: i for i, name in enumerate(scenarios)}
+    return df.sort_values("Scenario", key=lambda s: s.map(order), kind="stable").reset_index(drop=True)
+
+
+def solve_lane_allocation(lane_df, capacity_df, carry_capacity=False):
+    """solve_lane_allocation_batch for a single scenario."""
+
+    df = solve_lane_allocation_batch({"": (lane_df, capacity_df)}, carry_capacity=carry_capacity)
+    return df.drop(columns="Scenario")